@@ -0,0 +1,223 @@
+import streamlit as st
+
+from shared.analytics import track_cta_event
+from shared.cascade import MODE_AUTO, MODE_FAST
+from shared.clients import get_genai, get_supabase
+from shared.history import record_history, render_history_sidebar
+from shared.inference import analyze, get_cached_result
+from shared.session import get_result_ref, set_result_ref
+
+# =========================
+#  CSS & Responsive Styling
+# =========================
+CSS = """
+<style>
+
+html, body, [data-testid="stAppViewContainer"], .main {
+    direction: rtl !important;
+    text-align: right !important;
+    font-family: "Cairo", sans-serif;
+}
+
+/************  محتوى الصفحة الرئيسي  ************/
+
+.app-container {
+    max-width: 900px;
+    margin: 0 auto;
+    padding: 0 14px;
+}
+.stButton > button {
+    background-color: #e63946 !important;
+    color: #ffffff !important;
+    font-weight: 800;
+    border-radius: 28px;
+    border: none;
+    padding: 12px 18px;
+    height: 3.2em;
+    width: 100%;
+    font-size: 17px;
+    transition: 0.2s ease-in-out;
+}
+
+.stButton > button:hover {
+    background-color: #c82333 !important;
+    transform: scale(1.01);
+}
+
+
+/************  العناوين  ************/
+
+h1,h2,h3,h4,h5,h6 {
+    direction: rtl !important;
+    text-align: right !important;
+    margin-right: 0;
+}
+
+/************  الفقرات والنصوص  ************/
+
+p, div {
+    direction: rtl !important;
+    text-align: right !important;
+    word-break: break-word;
+    line-height: 1.9;
+}
+
+/************  القوائم — لضمان ظهور الأرقام  ************/
+
+ol, ul {
+    direction: rtl !important;
+    text-align: right !important;
+    list-style-position: inside !important; /* يمنع قصّ الأرقام */
+    padding-right: 0 !important;
+    margin-right: 0 !important;
+}
+
+ol li, ul li {
+    margin: 8px 0;
+    padding-right: 6px;
+}
+
+/************  تحسين القراءة على الموبايل  ************/
+
+@media (max-width: 600px) {
+
+    .app-container {
+        padding: 0 10px;
+    }
+
+    ol, ul {
+        list-style-position: inside !important; /* ضروري لعدم قص الأرقام */
+    }
+
+    li {
+        line-height: 2.1;
+    }
+}
+
+/************  الفوتر  ************/
+.footer-container {
+    width: 100%;
+    text-align: center;
+    margin-top: 45px;
+    padding-top: 20px;
+    border-top: 1px solid #666;
+    font-size: 13px;
+    display: flex;
+    justify-content: center;
+    gap: 6px;
+    flex-wrap: wrap;
+}
+
+.footer-container .rtl-text {
+    direction: rtl;
+    unicode-bidi: plaintext;
+    font-weight: 600;
+}
+
+.footer-container .ltr-text {
+    direction: ltr;
+    unicode-bidi: plaintext;
+}
+
+</style>
+"""
+
+
+def render_analysis(analysis: str):
+    """عرض نتيجة التحليل داخل صندوق النتائج."""
+    st.markdown(
+        """
+        <div class="result-box">
+            <div class="result-title">📊 تحليل النص وفق عوامل STEPPS الستّة:</div>
+            <div class="result-text">
+        """,
+        unsafe_allow_html=True,
+    )
+
+    # مخرجات التحليل (مع الحفاظ على الـ line breaks)
+    st.markdown(analysis, unsafe_allow_html=False)
+
+    st.markdown("</div></div>", unsafe_allow_html=True)
+
+
+def render(tool):
+    """واجهة مُحلّل الانتشار."""
+    # التأكد من تحميل المفاتيح السرّية قبل أي شيء (العملاء مشتركون بين الجلسات)
+    get_supabase()
+    get_genai()
+
+    st.markdown(CSS, unsafe_allow_html=True)
+    render_history_sidebar(tool.app_id)
+
+    st.title("🎯 مُحلّل احتمالية انتشار المحتوى الفيروسي")
+
+    with st.expander("💡 كيف يعمل هذا المحلل؟"):
+        st.markdown(
+            """
+              هذه الأداة تحلل نصّك (منشور، تغريدة، سكريبت فيديو...) بناءً على ستة عوامل:
+        
+            1. **Social Currency – العملة الاجتماعية:**  
+               هل يجعل المحتوى الشخص الذي يشاركه يبدو أذكى، أعمق، أو أكثر خبرة؟
+        
+            2. **Triggers – المحفّزات:**  
+               هل يرتبط المحتوى بمواقف وأحداث متكرّرة في حياة الناس (روتين، أماكن، عبارات يومية)؟
+        
+            3. **Emotion – المشاعر:**  
+               إلى أي درجة يثير النص مشاعر قوية مثل الدهشة، الحماس، الفضول، الإلهام أو حتى الغضب البنّاء؟
+        
+            4. **Public – الظهور العلني:**  
+               هل من السهل رؤية هذا السلوك أو تقليده؟ هل المحتوى قابل للمحاكاة أمام الآخرين؟
+        
+            5. **Practical Value – القيمة العملية:**  
+               هل يقدم النص فائدة ملموسة، نصائح قابلة للتطبيق، أو يوفر وقتاً/مالاً/جهداً على المتلقي؟
+        
+            6. **Stories – القصص:**  
+               هل المعلومة مغلفة داخل قصة أو مثال حي يجعل الرسالة سهلة التذكّر والمشاركة؟
+            """,
+            unsafe_allow_html=False,
+        )
+
+    post_text = st.text_area(
+        "✍️ أدخل نص المنشور / التغريدة / سكريبت الفيديو هنا:",
+        height=170,
+        placeholder="اكتب هنا النص الكامل الذي تريد قياس قابليته للانتشار (منشور، تغريدة، سكريبت فيديو، رسالة مبيعات...)",
+    )
+
+    fast_mode = st.toggle("⚡ وضع سريع", help="تحليل أسرع بنموذج أخف، مع الانتقال تلقائياً للنموذج الأكبر إذا لم تكتمل النتيجة.")
+
+    if st.button("تحليل الآن 🚀"):
+        if not post_text or len(post_text.strip()) < 20:
+            st.warning("الرجاء إدخال نص حقيقي لا يقل عن 20 حرفاً ليتم تحليله.")
+        else:
+            # تسجيل الـ CTA في التحليلات
+            track_cta_event(tool.app_id)
+
+            with st.spinner("⏳ جاري تحليل النص "):
+                analysis, content_hash = analyze(
+                    tool, mode=MODE_FAST if fast_mode else MODE_AUTO, text=post_text.strip()
+                )
+
+            if not analysis.strip():
+                st.error("لم يصلنا رد واضح من نموذج الذكاء الاصطناعي. حاولي مرة أخرى أو اختصري النص.")
+            else:
+                if content_hash:
+                    record_history(tool.app_id, content_hash, post_text)
+                    set_result_ref(tool.app_id, content_hash)
+                render_analysis(analysis)
+
+    elif get_result_ref(tool.app_id):
+        # عرض آخر تحليل (أو المختار من السجل) من الكاش المشترك عبر الهاش:
+        # الجلسة تحفظ المرجع فقط، ولا إعادة لاستدعاء Gemini
+        cached = get_cached_result(tool, get_result_ref(tool.app_id))
+        if cached:
+            render_analysis(cached)
+        else:
+            st.info("لم يعد هذا التحليل متوفراً في الكاش. أعيدي إدخال النص لتحليله من جديد.")
+
+    # الفوتر
+    st.markdown("""
+    <div class="footer-container">
+      <span class="rtl-text">جميع الحقوق محفوظة © 2026 |</span>
+      <span class="ltr-text">AI Product Builder - Layan Khalil</span>
+    </div>
+    """, unsafe_allow_html=True)
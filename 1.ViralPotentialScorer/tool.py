@@ -0,0 +1,84 @@
+import re
+
+from shared.hashing import hash_text
+from shared.registry import Tool
+
+# أسماء عوامل STEPPS الستة كما يطلبها الـ prompt (للتحقق من مخرجات النموذج السريع):
+# يكفي ظهور أي اسم من أسماء العامل (الإنجليزي أو العربي)، بعد إزالة التشكيل
+STEPPS_FACTORS = (
+    ("Social Currency", "العملة الاجتماعية"),
+    ("Triggers", "المحفزات"),
+    ("Emotion", "المشاعر"),
+    ("Public", "الظهور العام", "الظهور العلني"),
+    ("Practical Value", "القيمة العملية"),
+    ("Stories", "القصص"),
+)
+# الأرقام العربية-الهندية (٠-٩) والفارسية (۰-۹) → أرقام لاتينية
+DIGITS = str.maketrans("٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹٫", "01234567890123456789.")
+TASHKEEL = re.compile(r"[\u064B-\u0652\u0640]")
+SCORE_PATTERN = re.compile(r"\d+(?:\.\d+)?\s*(?:/|من)\s*10")
+SIMPLE_TEXT_MAX_CHARS = 280
+
+
+def build_prompt(text: str) -> str:
+    """بناء طلب تحليل STEPPS للنص المُدخل."""
+    return f"""
+أنت خبير محتوى فيروسي ومتخصص في نموذج STEPPS لجونا بيرجر.
+
+المطلوب:
+- حلّل النص التالي بناءً على **ستة عوامل STEPPS** فقط:
+  1) Social Currency (العملة الاجتماعية)
+  2) Triggers (المحفّزات)
+  3) Emotion (المشاعر)
+  4) Public (الظهور العام)
+  5) Practical Value (القيمة العملية)
+  6) Stories (القصص)
+
+قواعد صارمة:
+- لا تحسب ولا تعرض "نتيجة نهائية" من 100 أو أي مجموع للأرقام.
+- اكتفِ فقط بإعطاء تقييم رقمي من 10 لكل عامل + شرح من سطرين إلى ثلاثة كحد أقصى.
+- اكتب المخرجات كلها بالعربية، ووضّح اسم كل عامل ثم الدرجة ثم الشرح.
+- رتّب العوامل من 1 إلى 6 بنفس الترتيب السابق.
+- لا تذكر أي معادلات حسابية ولا نسبة مئوية إجمالية.
+
+النص المراد تحليله:
+{text}
+"""
+
+
+def is_simple(text: str) -> bool:
+    """نص قصير (بحجم تغريدة) يكفيه النموذج السريع."""
+    return len(text) <= SIMPLE_TEXT_MAX_CHARS
+
+
+def validate(analysis: str) -> bool:
+    """التحليل مقبول إذا غطّى العوامل الستة وأعطى درجة رقمية لكل منها."""
+    if not analysis.strip():
+        return False
+    normalized = TASHKEEL.sub("", analysis).translate(DIGITS).lower()
+    if not all(any(name.lower() in normalized for name in names) for names in STEPPS_FACTORS):
+        return False
+    return len(SCORE_PATTERN.findall(normalized)) >= len(STEPPS_FACTORS)
+
+
+TOOL = Tool(
+    app_id="viral-potential-scorer-v1",
+    title="مُحلّل الانتشار",
+    icon="🎯",
+    prompt=build_prompt,
+    content_hash=hash_text,
+    model="gemini-2.0-flash-exp",
+    fast_model="gemini-2.0-flash-lite",
+    is_simple=is_simple,
+    validate=validate,
+    generation={
+        "temperature": 0.0,
+        "top_p": 0.1,
+        "top_k": 1,
+        "max_output_tokens": 900,
+    },
+    page_config={
+        "page_title": "Viral Scorer | مُحلّل الانتشار",
+        "layout": "centered",
+    },
+)
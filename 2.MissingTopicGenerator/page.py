@@ -0,0 +1,303 @@
+import pandas as pd
+import streamlit as st
+
+from shared.analytics import track_cta_event
+from shared.cascade import MODE_AUTO, MODE_FAST
+from shared.clients import get_genai, get_supabase
+from shared.history import record_history, render_history_sidebar
+from shared.inference import analyze, get_cached_result
+from shared.session import get_result_ref, set_result_ref
+
+# =========================================================
+# CSS: RTL + Responsive + هوامش + فوتر
+# =========================================================
+CSS = """
+    <style>
+    @import url('https://fonts.googleapis.com/css2?family=Cairo:wght@400;600;700&display=swap');
+
+    html, body, [data-testid="stAppViewContainer"], .main {
+        font-family: 'Cairo', sans-serif;
+        direction: rtl;
+        text-align: right;
+    }
+
+    /* حاوية عامة لضبط الهوامش من اليمين */
+    .app-container {
+        direction: rtl;
+        text-align: right;
+        padding-right: 0.5rem;
+        padding-left: 0.5rem;
+    }
+
+    /* مربعات النص */
+    .stTextArea textarea {
+        direction: rtl !important;
+        text-align: right !important;
+        border-radius: 12px !important;
+        font-size: 15px !important;
+    }
+
+    .stTextInput input {
+        direction: rtl !important;
+        text-align: right !important;
+    }
+
+    /* الأزرار */
+    .stButton > button {
+        width: 100%;
+        border-radius: 999px;
+        height: 3.2em;
+        background-color: #2563eb !important;
+        color: #ffffff !important;
+        font-weight: 700;
+        border: none;
+        font-size: 16px;
+        box-shadow: 0 4px 12px rgba(37, 99, 235, 0.35);
+        transition: all 0.2s ease-in-out;
+    }
+
+    .stButton > button:hover {
+        background-color: #1d4ed8 !important;
+        transform: translateY(-1px);
+        box-shadow: 0 6px 18px rgba(37, 99, 235, 0.45);
+    }
+
+    /* عنوان التطبيق في المنتصف RTL */
+    .main-title {
+        text-align: center !important;
+        direction: rtl !important;
+        font-weight: 800;
+        margin-bottom: 0.25rem;
+    }
+    .main-subtitle {
+        text-align: center !important;
+        direction: rtl !important;
+        color: #6b7280;
+        margin-bottom: 1.5rem;
+        font-size: 0.95rem;
+    }
+
+    /* صندوق النتائج/النصوص */
+    .analysis-box {
+        background: #f9fafb;
+        border-radius: 14px;
+        padding: 18px 18px;
+        border: 1px solid #e5e7eb;
+        margin-top: 1rem;
+    }
+
+    .analysis-box h3 {
+        margin-top: 0;
+        margin-bottom: 0.75rem;
+        color: #111827;
+        font-weight: 700;
+        text-align: right;
+    }
+
+    .analysis-box p {
+        margin: 0 0 0.35rem 0;
+        line-height: 1.6;
+        text-align: right;
+    }
+
+    /* تنسيق الـ DataFrame ليبدو مرتب */
+    .stDataFrame {
+        direction: rtl;
+        text-align: right;
+    }
+
+    /* الفوتر: نص عربي يمين + إنجليزي يسار، لكن الكل في المنتصف */
+    .footer-container {
+        display: flex;
+        justify-content: center;
+        align-items: center;
+        gap: 6px;
+        margin-top: 40px;
+        padding-top: 16px;
+        border-top: 1px solid #e5e7eb;
+        font-size: 0.8rem;
+        color: #6b7280;
+    }
+
+    .footer-rtl {
+        direction: rtl;
+        text-align: right;
+        white-space: nowrap;
+    }
+
+    .footer-ltr {
+        direction: ltr;
+        text-align: left;
+        white-space: nowrap;
+    }
+
+    /* جعل كل شيء Responsive بشكل افتراضي (Streamlit يدعم ذلك) */
+    @media (max-width: 768px) {
+        .app-container {
+            padding-right: 0.25rem;
+            padding-left: 0.25rem;
+        }
+    }
+    </style>
+    """
+
+# تسمية الأعمدة بالعربية
+TOPIC_COLUMNS = {
+    "topic_title": "عنوان الموضوع المقترح",
+    "gap_reason": "سبب كونه فجوة/فرصة",
+    "format_suggestion": "اقتراح صيغة المحتوى",
+}
+
+
+def topics_frame(topics: list) -> pd.DataFrame:
+    """
+    تحويل قائمة المواضيع إلى DataFrame بأعمدة عربية للعرض المنظم.
+    """
+    return pd.DataFrame(topics).rename(columns=TOPIC_COLUMNS)
+
+
+def render_result(result: dict):
+    """
+    عرض نتيجة التحليل: الملخص العام + جدول المواضيع المفقودة.
+    """
+    st.markdown("### 📌 ملخص النمط العام للمحتوى")
+    st.markdown(
+        f"""<div class="analysis-box"><p>{result.get('summary_analysis', 'لا يوجد ملخص متوفر.')}</p></div>""",
+        unsafe_allow_html=True,
+    )
+
+    st.markdown("---")
+    st.markdown("### 🎯 المواضيع المفقودة المقترحة (Missing Topics)")
+
+    topics = result.get("missing_topics", [])
+    if topics:
+        st.dataframe(topics_frame(topics), use_container_width=True)
+    else:
+        st.info("لم يتمكن النموذج من تحديد مواضيع مفقودة بوضوح. جرّبي إدخال قوائم أكثر تنوّعاً أو تفصيلاً.")
+
+
+def render(tool):
+    """
+    واجهة مُنشئ المحتوى المفقود.
+    """
+    # التأكد من تحميل المفاتيح السرّية قبل أي شيء (العملاء مشتركون بين الجلسات)
+    get_supabase()
+    get_genai()
+
+    st.markdown(CSS, unsafe_allow_html=True)
+    render_history_sidebar(tool.app_id)
+
+    st.markdown('<div class="app-container">', unsafe_allow_html=True)
+
+    st.markdown('<h1 class="main-title">🧩 مُنشئ المحتوى المفقود</h1>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="main-subtitle">حلّل منشوراتك ومنشورات منافسيك لاكتشاف المواضيع التي ينتظرها جمهورك ولم يتحدث عنها أحد بعمق.</div>',
+        unsafe_allow_html=True,
+    )
+
+    with st.expander("ℹ️ ما الذي تفعله هذه الأداة؟"):
+        st.markdown(
+            """
+            هذه الأداة تساعدك على **تحليل فجوات المحتوى (Content Gaps)** بين:
+        
+            - ما تنشره أنت حاليًا (بوستات، ريلز، فيديوهات، مقالات...)
+            - وما ينشره منافسوك في نفس السوق أو النيتش
+        
+            ثم تقترح لك:
+        
+            - 🧠 مواضيع *مهمّة* لم تتناولها بما يكفي  
+            - 🎯 أسباب كون كل موضوع فرصة قوية للنمو  
+            - 🎥 واقتراح صيغة محتوى لكل موضوع (ريل، كاروسيل، لايف، سلسلة بوستات...)
+        
+            الهدف أن تخرجي من الأداة بقائمة جاهزة من **أفكار محتوى استراتيجية** بدلاً من النشر العشوائي.
+            """
+        )
+
+    st.markdown("---")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        my_posts_input = st.text_area(
+            "منشوراتك العشرة الأخيرة (عناوين أو ملخصات سريعة):",
+            height=260,
+            placeholder=(
+                "مثال:\n"
+                "1. ليه المحتوى التعليمي ما بجيب مبيعات؟\n"
+                "2. رحلتي من أول عميل حر إلى أول 1000$ شهريًا\n"
+                "3. 3 أخطاء بتقتل تفاعل الريلز عندك\n"
+                "4. كيف تستخدم لينكدإن لبناء براند مهني...\n"
+            ),
+            key="my_posts",
+        )
+
+    with col2:
+        competitor_posts_input = st.text_area(
+            "أهم منشورات منافسيك (أو الحسابات الملهمة لك):",
+            height=260,
+            placeholder=(
+                "مثال:\n"
+                "1. خطة محتوى أسبوعية جاهزة لخبراء السوشال ميديا\n"
+                "2. كيف تعمل لانش لمنتحك في 7 أيام\n"
+                "3. أكثر أنواع الريلز انتشارًا في 2025\n"
+                "4. تحليل حساب وصل من 0 إلى 100K متابع...\n"
+            ),
+            key="competitor_posts",
+        )
+
+    fast_mode = st.toggle("⚡ وضع سريع", help="تحليل أسرع بنموذج أخف، مع الانتقال تلقائياً للنموذج الأكبر إذا لم تطابق النتيجة المخطط.")
+
+    analyze_button = st.button("🔍 تحليل الفجوات واقتراح المواضيع", use_container_width=True)
+
+    if analyze_button:
+        if not my_posts_input.strip() or not competitor_posts_input.strip():
+            st.warning("يرجى تعبئة القائمتين قبل بدء التحليل.")
+        elif len(my_posts_input.strip()) < 40 or len(competitor_posts_input.strip()) < 40:
+            st.warning("للحصول على تحليل أدق، يُفضّل أن تحتوي كل قائمة على عدة عناوين أو ملخصات (وليس جملة واحدة فقط).")
+        else:
+            # تسجيل CTA في analytics
+            track_cta_event(tool.app_id)
+
+            # عرض المواضيع فور اكتمال كل عنصر في الرد المتدفق
+            preview = st.empty()
+
+            def show_partial(topics: list):
+                preview.dataframe(topics_frame(topics), use_container_width=True)
+
+            with st.spinner("جاري تحليل المحتوى المُقارَن واكتشاف الفرص المخفية..."):
+                result, content_hash = analyze(
+                    tool,
+                    mode=MODE_FAST if fast_mode else MODE_AUTO,
+                    on_items=show_partial,
+                    my_posts=my_posts_input,
+                    competitor_posts=competitor_posts_input,
+                )
+            preview.empty()
+
+            if result:
+                # النتيجة الجزئية (بعد إصلاح رد مقطوع) تُعرض فقط ولا تدخل السجل
+                if content_hash:
+                    record_history(tool.app_id, content_hash, my_posts_input)
+                    set_result_ref(tool.app_id, content_hash)
+                render_result(result)
+
+    elif get_result_ref(tool.app_id):
+        # عرض آخر تحليل (أو المختار من السجل) من الكاش المشترك عبر الهاش:
+        # الجلسة تحفظ المرجع فقط، ولا إعادة لاستدعاء Gemini
+        cached = get_cached_result(tool, get_result_ref(tool.app_id))
+        if cached is not None:
+            render_result(cached)
+        else:
+            st.info("لم يعد هذا التحليل متوفراً في الكاش. أعيدي إدخال القائمتين لتحليلهما من جديد.")
+
+    st.markdown(
+        """
+        <div class="footer-container">
+          <span class="footer-rtl">جميع الحقوق محفوظة @ 2026 |</span>
+          <span class="footer-ltr">AI Product Builder - Layan Khalil</span>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,118 @@
+from shared.hashing import hash_parts
+from shared.registry import Tool
+
+SYSTEM_PROMPT = (
+    "أنت خبير استراتيجي في المحتوى التسويقي متخصص في تحليل الفجوات (Content Gap Analysis). "
+    "مهمتك هي مقارنة قائمة منشورات (العميل) مع قائمة منشورات (المنافسين)، "
+    "ثم استخراج 5–7 مواضيع مهمة لم يتم تغطيتها بما يكفي، أو يتم تجاهلها، "
+    "مع توضيح سبب كون كل موضوع فرصة قوية للنمو."
+)
+
+# مدخلات قصيرة (بضعة عناوين فقط) يكفيها النموذج السريع
+SIMPLE_INPUT_MAX_CHARS = 600
+TOPIC_FIELDS = ("topic_title", "gap_reason", "format_suggestion")
+
+SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "missing_topics": {
+            "type": "ARRAY",
+            "description": "قائمة بالمواضيع الاستراتيجية التي يُنصح بتغطيتها.",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "topic_title": {
+                        "type": "STRING",
+                        "description": "عنوان مختصر للموضوع المقترح.",
+                    },
+                    "gap_reason": {
+                        "type": "STRING",
+                        "description": "لماذا يُعد هذا الموضوع فجوة أو فرصة؟",
+                    },
+                    "format_suggestion": {
+                        "type": "STRING",
+                        "description": "أفضل صيغة محتوى لهذا الموضوع (ريل، كاروسيل، مقال، لايف...).",
+                    },
+                },
+            },
+        },
+        "summary_analysis": {
+            "type": "STRING",
+            "description": "ملخص للنمط العام لمحتوى العميل مقابل المنافسين، مع توصيات عامة.",
+        },
+    },
+}
+
+
+def build_prompt(my_posts: str, competitor_posts: str) -> str:
+    """
+    بناء طلب تحليل الفجوات بين منشورات العميل ومنشورات المنافسين.
+    """
+    return f"""
+    🔹 قائمة منشورات العميل (عناوين أو ملخصات مختصرة):
+    {my_posts}
+
+    🔹 قائمة منشورات المنافسين (عناوين أو ملخصات مختصرة):
+    {competitor_posts}
+
+    المطلوب:
+    1) تحليل نمط محتوى العميل مقابل المنافسين.
+    2) اكتشاف الفجوات (مواضيع غير مغطاة عند العميل أو لم تُغطَّ بعمق).
+    3) اقتراح 5–7 مواضيع (Missing Topics) يمكن أن تصبح محتوى قويّ الأداء.
+    """
+
+
+def build_content_hash(my_posts: str, competitor_posts: str) -> str:
+    """
+    هاش ثابت لمدخلات المستخدم (منشوراتك + منشورات المنافسين).
+    """
+    return hash_parts(my_posts, competitor_posts)
+
+
+def is_simple(my_posts: str, competitor_posts: str) -> bool:
+    """
+    هل المدخلات قصيرة بما يكفي للنموذج السريع؟
+    """
+    return len(my_posts) + len(competitor_posts) <= SIMPLE_INPUT_MAX_CHARS
+
+
+def validate(result) -> bool:
+    """
+    التحقق من مطابقة النتيجة للمخطط:
+    - summary_analysis نص غير فارغ.
+    - missing_topics قائمة غير فارغة، وكل عنصر فيها يحتوي الحقول الثلاثة كنصوص غير فارغة.
+    """
+    if not isinstance(result, dict):
+        return False
+    summary = result.get("summary_analysis")
+    topics = result.get("missing_topics")
+    if not isinstance(summary, str) or not summary.strip():
+        return False
+    if not isinstance(topics, list) or not topics:
+        return False
+    return all(
+        isinstance(topic, dict)
+        and all(isinstance(topic.get(f), str) and topic[f].strip() for f in TOPIC_FIELDS)
+        for topic in topics
+    )
+
+
+TOOL = Tool(
+    app_id="missing-topic-generator",
+    title="مُنشئ المحتوى المفقود",
+    icon="🧩",
+    prompt=build_prompt,
+    content_hash=build_content_hash,
+    model="gemini-2.5-flash",
+    fast_model="gemini-2.5-flash-lite",
+    is_simple=is_simple,
+    validate=validate,
+    schema=SCHEMA,
+    stream_key="missing_topics",
+    system_instruction=SYSTEM_PROMPT,
+    page_config={
+        "page_title": "9/100: مُنشئ المحتوى المفقود",
+        "layout": "wide",
+        "initial_sidebar_state": "collapsed",
+    },
+)
@@ -0,0 +1,15 @@
+"""
+البنية المشتركة لأدوات 100-Days-AI-Lab:
+- clients:   عملاء Supabase و Gemini (نسخة واحدة لكل عملية).
+- hashing:   هاش ثابت لمدخلات الأدوات.
+- cache:     طبقة كاش موحدة (ذاكرة محلية + viral_scores_cache).
+- analytics: تتبع الزيارات وضغطات CTA مع تجميع محلي.
+- history:   سجل التحليلات لكل زائر عبر الجلسات.
+- inference: استدعاء Gemini الموحّد لأي أداة مسجّلة.
+- cascade:   التوجيه بين النموذج السريع والنموذج الأكبر.
+- jsonstream: تحليل JSON المتدفق تدريجياً وإصلاحه.
+- replay:    تسجيل حركة Gemini/Supabase وإعادة تشغيلها (bench للقياس).
+- session:   حالة جلسات محدودة الذاكرة (مراجع بالهاش + حذف الخامل).
+- memprof:   قياس ذاكرة العامل لكل جلسة عبر tracemalloc.
+- registry:  سجل الأدوات وتحميل صفحاتها عند الطلب.
+"""
@@ -0,0 +1,230 @@
+import atexit
+import base64
+import hashlib
+import math
+import threading
+import uuid
+from datetime import datetime, timezone
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from shared.clients import get_supabase
+
+# =========================================================
+# التتبع (زيارات + CTA) مع تجميع محلي بدلاً من RPC لكل حدث
+# =========================================================
+
+# المشاهدات وضغطات CTA والزوار الفريدين تُجمَّع في الذاكرة لكل APP_ID
+# (مشتركة بين كل جلسات العامل)، ثم تُدفع كل ANALYTICS_FLUSH_SECONDS
+# بعملية upsert واحدة إلى analytics_rollups.
+
+ANALYTICS_FLUSH_SECONDS = 60
+VISITOR_COOKIE = "lab_vid"
+VISITOR_COOKIE_MAX_AGE = 365 * 24 * 3600
+HLL_PRECISION = 12  # 4096 سجلاً → خطأ معياري ≈ 1.04/√4096 ≈ 1.6%
+
+
+def _hll_sigma(x: float) -> float:
+    # تصحيح السجلات الصفرية في مقدّر Ertl (يقابل العد الخطي للقيم الصغيرة)
+    y, z = 1.0, x
+    while True:
+        x *= x
+        z_old, z = z, z + x * y
+        y += y
+        if z == z_old:
+            return z
+
+
+def _hll_tau(x: float) -> float:
+    # تصحيح السجلات المشبعة (rank = q + 1) للقيم الكبيرة جداً
+    if x in (0.0, 1.0):
+        return 0.0
+    y, z = 1.0, 1 - x
+    while True:
+        x = math.sqrt(x)
+        y *= 0.5
+        z_old, z = z, z - (1 - x) ** 2 * y
+        if z == z_old:
+            return z / 3
+
+
+class HyperLogLog:
+    """عدّاد تقريبي للزوار الفريدين بذاكرة ثابتة (2^p بايت)."""
+
+    def __init__(self, p: int = HLL_PRECISION):
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+
+    def add(self, value: str):
+        x = int.from_bytes(hashlib.sha1(value.encode("utf-8")).digest()[:8], "big")
+        idx = x >> (64 - self.p)
+        rest = x & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def count(self) -> int:
+        """
+        مقدّر Ertl المحسّن (2017): بلا انحياز يُذكر على كامل المدى،
+        فلا حاجة للتبديل إلى العد الخطي ولا لجداول تصحيح تجريبية.
+        """
+        m = self.m
+        q = 64 - self.p
+        zeros = self.registers.count(0)
+        if zeros == m:
+            return 0
+        full = self.registers.count(q + 1)
+        z = m * _hll_tau(1 - full / m) * 2.0 ** -q
+        z += sum(2.0 ** -r for r in self.registers if 0 < r <= q)
+        z += m * _hll_sigma(zeros / m)
+        return round(m * m / (2 * math.log(2)) / z)
+
+    def to_b64(self) -> str:
+        return base64.b64encode(bytes(self.registers)).decode("ascii")
+
+
+class AnalyticsBuffer:
+    """
+    مخزن مؤقت للتحليلات على مستوى العامل (worker):
+    - القيم تراكمية داخل نافذة الساعة، فإعادة الدفع بعد فشل لا تضاعف العدّ.
+    - النوافذ المنتهية تُحذف من الذاكرة بعد دفعها بنجاح.
+    - الدفع يتم من خيط خلفي كل ANALYTICS_FLUSH_SECONDS، حتى بدون زيارات جديدة،
+      ولا يمر أي طلب شبكة عبر خيط جلسة الزائر.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.worker_id = uuid.uuid4().hex
+        self.lock = threading.Lock()
+        self.rollups = {}  # (app_id, bucket_start) -> {"views", "cta_clicks", "hll"}
+        self.dirty = set()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="analytics-flush", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while not self.stopped.wait(ANALYTICS_FLUSH_SECONDS):
+            self.flush()
+
+    def stop(self):
+        """
+        إيقاف الخيط الخلفي ودفع ما تبقّى (عند إنهاء العملية).
+        """
+        self.stopped.set()
+        self.flush()
+
+    def _rollup(self, app_id: str) -> dict:
+        bucket = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        key = (app_id, bucket)
+        if key not in self.rollups:
+            self.rollups[key] = {"views": 0, "cta_clicks": 0, "hll": HyperLogLog()}
+        self.dirty.add(key)
+        return self.rollups[key]
+
+    def record_visit(self, app_id: str, visitor_id: str):
+        with self.lock:
+            rollup = self._rollup(app_id)
+            rollup["views"] += 1
+            rollup["hll"].add(visitor_id)
+
+    def record_cta(self, app_id: str):
+        with self.lock:
+            self._rollup(app_id)["cta_clicks"] += 1
+
+    def flush(self):
+        with self.lock:
+            keys = list(self.dirty)
+            rows = [
+                {
+                    "app_id": app_id,
+                    "worker_id": self.worker_id,
+                    "bucket_start": bucket.isoformat(),
+                    "views": self.rollups[(app_id, bucket)]["views"],
+                    "cta_clicks": self.rollups[(app_id, bucket)]["cta_clicks"],
+                    "visitors_hll": self.rollups[(app_id, bucket)]["hll"].to_b64(),
+                    "unique_visitors_est": self.rollups[(app_id, bucket)]["hll"].count(),
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                }
+                for app_id, bucket in keys
+            ]
+            self.dirty.clear()
+        if not rows:
+            return
+        try:
+            self.client.table("analytics_rollups").upsert(
+                rows, on_conflict="app_id,worker_id,bucket_start"
+            ).execute()
+        except Exception as e:
+            print(f"[analytics_flush] Error: {e}")
+            with self.lock:
+                self.dirty.update(keys)
+            return
+        current = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        with self.lock:
+            for key in keys:
+                if key[1] < current and key not in self.dirty:
+                    self.rollups.pop(key, None)
+
+
+@st.cache_resource
+def get_analytics_buffer() -> AnalyticsBuffer:
+    # العميل يُمرَّر من خيط الجلسة، فالخيط الخلفي لا يحتاج سياق Streamlit
+    buffer = AnalyticsBuffer(get_supabase())
+    atexit.register(buffer.stop)
+    return buffer
+
+
+def _persist_visitor_cookie(visitor_id: str):
+    """
+    حفظ المعرف في كوكي المتصفح (لا يظهر في الرابط فلا ينتقل عند مشاركته).
+    st.context.cookies للقراءة فقط، لذا نكتب الكوكي عبر سكربت صغير في الصفحة الأم.
+    components.v1.html مُعلَن إيقافه في إصدارات streamlit الأحدث، لذا الإصدار مثبّت
+    في requirements.txt على نطاق يدعم st.context.cookies وهذه الكتابة معاً.
+    """
+    components.html(
+        f"""<script>
+        window.parent.document.cookie =
+            "{VISITOR_COOKIE}={visitor_id}; path=/; max-age={VISITOR_COOKIE_MAX_AGE}; SameSite=Strict";
+        </script>""",
+        height=0,
+    )
+
+
+def get_session_visitor_id() -> str:
+    """
+    معرف زائر ثابت عبر الجلسات:
+    - يُقرأ من كوكي المتصفح إن وُجد وكان UUID صالحاً.
+    - وإلا يُولَّد معرف جديد ويُحفظ في الكوكي، فيعود به الزائر لاحقاً.
+    - لا نقبل المعرف من رابط الصفحة: الروابط تُشارك، ومعها سجل صاحبها.
+    """
+    if "visitor_id" not in st.session_state:
+        try:
+            visitor_id = str(uuid.UUID(st.context.cookies.get(VISITOR_COOKIE, "")))
+        except ValueError:
+            visitor_id = str(uuid.uuid4())
+            _persist_visitor_cookie(visitor_id)
+        st.session_state["visitor_id"] = visitor_id
+    return st.session_state["visitor_id"]
+
+
+def track_visit(app_id: str):
+    """
+    تسجيل زيارة في المخزن المحلي (تُدفع لاحقاً إلى analytics_rollups دفعة واحدة).
+    """
+    try:
+        get_analytics_buffer().record_visit(app_id, get_session_visitor_id())
+    except Exception as e:
+        # نطبع في الـ logs فقط ولا نُفشل التطبيق
+        print(f"[track_visit] Error: {e}")
+
+
+def track_cta_event(app_id: str):
+    """
+    تسجيل ضغطة زر (CTA) في المخزن المحلي للتحليلات.
+    """
+    try:
+        get_analytics_buffer().record_cta(app_id)
+    except Exception as e:
+        print(f"[track_cta_event] Error: {e}")
@@ -0,0 +1,133 @@
+"""
+قياس الأداء دون اتصال بالشبكة عبر إعادة تشغيل حركة مسجّلة.
+
+التسجيل (على بيئة حقيقية):
+    LAB_TRAFFIC_MODE=record LAB_TRAFFIC_FILE=traffic.jsonl.gz streamlit run streamlit_app.py
+
+إعادة التشغيل والقياس (بدون شبكة):
+    python -m shared.bench traffic.jsonl.gz --scale 1.0 --concurrency 8 --out build-a.json
+    python -m shared.bench traffic.jsonl.gz --compare build-a.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# مقاييس الأكبر فيها أفضل: تُعكس إشارتها في compare
+HIGHER_IS_BETTER = {"throughput_per_s"}
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: list, wall: float) -> dict:
+    return {
+        "calls": len(latencies),
+        "throughput_per_s": round(len(latencies) / wall, 3) if wall > 0 else 0.0,
+        "mean_s": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+        "p50_s": round(percentile(latencies, 50), 4),
+        "p95_s": round(percentile(latencies, 95), 4),
+        "p99_s": round(percentile(latencies, 99), 4),
+    }
+
+
+def recorded_span(calls: list, scale: float) -> float:
+    """
+    المدة الفعلية التي استغرقها التسجيل (من أول استدعاء إلى نهاية آخر استدعاء)،
+    فتعكس الإنتاجية المسجّلة التزامن الحقيقي وقت التسجيل لا 1/المتوسط.
+    """
+    if not calls:
+        return 0.0
+    field = "ts" if all("ts" in event for event in calls) else "t"
+    first = min(event[field] for event in calls)
+    last = max(event[field] + event["latency"] for event in calls)
+    return (last - first) * scale
+
+
+def run(trace: str, scale: float, concurrency: int) -> dict:
+    # يجب ضبط الوضع قبل استيراد shared.clients حتى تُبنى العملاء كأغلفة replay
+    os.environ["LAB_TRAFFIC_MODE"] = "replay"
+    os.environ["LAB_TRAFFIC_FILE"] = trace
+    os.environ["LAB_LATENCY_SCALE"] = str(scale)
+
+    from shared.inference import analyze
+    from shared.registry import discover_tools
+    from shared.replay import get_tape, load_events
+
+    tools = {tool.app_id: tool for tool in discover_tools()}
+    calls = [event for event in load_events(trace) if event["kind"] == "call"]
+    recorded = [event["latency"] * scale for event in calls]
+    errors = []
+
+    def replay_call(event: dict) -> float:
+        start = time.monotonic()
+        try:
+            analyze(tools[event["app_id"]], **event["inputs"])
+        except Exception as e:
+            errors.append(repr(e))
+        return time.monotonic() - start
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(replay_call, calls))
+    wall = time.monotonic() - start
+
+    return {
+        "trace": trace,
+        "scale": scale,
+        "concurrency": concurrency,
+        "replayed": summarize(latencies, wall),
+        "recorded": summarize(recorded, recorded_span(calls, scale)),
+        "errors": len(errors),
+        "replay_misses": get_tape().misses,
+        "replay_write_fallbacks": get_tape().fallbacks,
+    }
+
+
+def compare(current: dict, baseline: dict) -> dict:
+    """
+    الفرق النسبي بين بناءين لكل مقياس، والموجب يعني تراجعاً في current دائماً:
+    - مقاييس الزمن (p50/p95/...): موجب = أبطأ.
+    - throughput_per_s: الإشارة معكوسة، فموجب = إنتاجية أقل.
+    """
+    deltas = {}
+    for metric, value in current["replayed"].items():
+        base = baseline["replayed"].get(metric)
+        if metric != "calls" and base:
+            delta = (value - base) / base * 100
+            if metric in HIGHER_IS_BETTER:
+                delta = -delta
+            deltas[metric] = round(delta, 2)
+    return deltas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded Gemini/Supabase traffic and report latency.")
+    parser.add_argument("trace", help="ملف التسجيل (jsonl.gz)")
+    parser.add_argument("--scale", type=float, default=1.0, help="معامل زمن الاستجابة (0 = بدون انتظار)")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--out", help="حفظ التقرير بصيغة JSON")
+    parser.add_argument("--compare", help="تقرير سابق للمقارنة (٪ فرق)")
+    args = parser.parse_args(argv)
+
+    report = run(args.trace, args.scale, args.concurrency)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["delta_pct"] = compare(report, json.load(f))
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
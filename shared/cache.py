@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+from shared.clients import get_supabase
+
+# =========================================================
+# طبقة الكاش الموحدة:
+# 1) ذاكرة محلية (LRU) مشتركة بين كل الجلسات والأدوات في العملية.
+# 2) جدول viral_scores_cache في Supabase مفتاحه (app_id, content_hash).
+# =========================================================
+
+CACHE_TABLE = "viral_scores_cache"
+LOCAL_CACHE_SIZE = 512
+
+
+class LocalCache:
+    """
+    كاش LRU محدود الحجم في الذاكرة، آمن للاستخدام من عدة جلسات في نفس الوقت.
+    """
+
+    def __init__(self, max_entries: int = LOCAL_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+@st.cache_resource
+def get_local_cache() -> LocalCache:
+    return LocalCache()
+
+
+def get_cached(app_id: str, content_hash: str):
+    """
+    قراءة نتيجة سابقة (نص خام) من الذاكرة المحلية ثم من Supabase إن وجدت.
+    """
+    local = get_local_cache()
+    cached_text = local.get((app_id, content_hash))
+    if cached_text:
+        return cached_text
+
+    try:
+        res = (
+            get_supabase()
+            .table(CACHE_TABLE)
+            .select("analysis_text")
+            .eq("app_id", app_id)
+            .eq("content_hash", content_hash)
+            .limit(1)
+            .execute()
+        )
+        if res.data:
+            cached_text = res.data[0]["analysis_text"]
+            if cached_text:
+                local.put((app_id, content_hash), cached_text)
+                return cached_text
+    except Exception as e:
+        print(f"[cache_read] Error: {e}")
+    return None
+
+
+def save_cached(app_id: str, content_hash: str, analysis_text: str):
+    """
+    تخزين النتيجة في الذاكرة المحلية وفي Supabase (Best-effort).
+    """
+    get_local_cache().put((app_id, content_hash), analysis_text)
+    try:
+        get_supabase().table(CACHE_TABLE).upsert(
+            {
+                "app_id": app_id,
+                "content_hash": content_hash,
+                "analysis_text": analysis_text,
+            },
+            on_conflict="app_id,content_hash",
+        ).execute()
+    except Exception as e:
+        print(f"[cache_write] Error: {e}")
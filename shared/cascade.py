@@ -0,0 +1,114 @@
+import threading
+
+import streamlit as st
+
+# =========================================================
+# التوجيه المتدرّج بين النماذج (Model Cascade)
+# - FAST: النموذج الأرخص والأسرع للمدخلات القصيرة/البسيطة أو في "الوضع السريع".
+# - FULL: النموذج الأكبر، ولا نصعد إليه إلا إذا فشل التحقق من مخرجات FAST.
+# =========================================================
+
+FAST = "fast"
+FULL = "full"
+
+MODE_AUTO = "auto"
+MODE_FAST = "fast"
+MODE_QUALITY = "quality"
+
+
+def choose_tier(tool, mode: str, inputs: dict) -> str:
+    """
+    اختيار طبقة الخدمة الأولى للطلب.
+    """
+    if not tool.fast_model or mode == MODE_QUALITY:
+        return FULL
+    if mode == MODE_FAST or (tool.is_simple is not None and tool.is_simple(**inputs)):
+        return FAST
+    return FULL
+
+
+class CascadeMetrics:
+    """
+    مقاييس التوجيه لكل أداة (مشتركة بين كل الجلسات في العملية):
+    - escalation_rate: نسبة طلبات FAST التي فشل تحققها وصعدت إلى FULL.
+    - latency_saved_s: الزمن الموفَّر تقديرياً = متوسط زمن FULL - زمن FAST لكل طلب نجح،
+      مطروحاً منه زمن FAST الضائع في كل تصعيد.
+      طلبات FAST التي تسبق أول استدعاء FULL تُحسب أزمنتها جانباً،
+      ثم يُضاف توفيرها عند وصول أول زمن FULL حتى لا ينحاز المقياس للسالب.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.apps = {}
+
+    def _stats(self, app_id: str) -> dict:
+        return self.apps.setdefault(
+            app_id,
+            {
+                "fast_served": 0,
+                "escalations": 0,
+                "full_calls": 0,
+                "full_latency_avg": None,
+                "latency_saved_s": 0.0,
+                "pending_fast": 0,
+                "pending_fast_latency": 0.0,
+            },
+        )
+
+    def record_full(self, app_id: str, latency: float):
+        with self.lock:
+            stats = self._stats(app_id)
+            stats["full_calls"] += 1
+            avg = stats["full_latency_avg"]
+            # متوسط متحرك أسّي حتى يتابع تغيّر زمن النموذج الأكبر
+            stats["full_latency_avg"] = latency if avg is None else 0.9 * avg + 0.1 * latency
+            if avg is None and stats["pending_fast"]:
+                # أول زمن FULL: احتساب توفير طلبات FAST السابقة له
+                stats["latency_saved_s"] += (
+                    stats["pending_fast"] * latency - stats["pending_fast_latency"]
+                )
+                stats["pending_fast"] = 0
+                stats["pending_fast_latency"] = 0.0
+
+    def record_fast(self, app_id: str, latency: float):
+        with self.lock:
+            stats = self._stats(app_id)
+            stats["fast_served"] += 1
+            if stats["full_latency_avg"] is not None:
+                stats["latency_saved_s"] += stats["full_latency_avg"] - latency
+            else:
+                stats["pending_fast"] += 1
+                stats["pending_fast_latency"] += latency
+
+    def record_escalation(self, app_id: str, fast_latency: float):
+        with self.lock:
+            stats = self._stats(app_id)
+            stats["escalations"] += 1
+            stats["latency_saved_s"] -= fast_latency
+
+    def snapshot(self, app_id: str) -> dict:
+        with self.lock:
+            stats = dict(self._stats(app_id))
+        attempts = stats["fast_served"] + stats["escalations"]
+        stats["escalation_rate"] = stats["escalations"] / attempts if attempts else 0.0
+        return stats
+
+
+@st.cache_resource
+def get_cascade_metrics() -> CascadeMetrics:
+    return CascadeMetrics()
+
+
+def render_cascade_metrics(app_id: str):
+    """
+    عرض مقاييس التوجيه في الشريط الجانبي عند فتح الصفحة بـ ?metrics=1.
+    """
+    if st.query_params.get("metrics") != "1":
+        return
+    stats = get_cascade_metrics().snapshot(app_id)
+    with st.sidebar.expander("⚡ مقاييس التوجيه بين النماذج"):
+        st.metric("نسبة التصعيد", f"{stats['escalation_rate']:.0%}")
+        st.metric("الزمن الموفَّر (ث)", f"{stats['latency_saved_s']:.1f}")
+        st.caption(
+            f"FAST: {stats['fast_served']} | تصعيد: {stats['escalations']} | FULL: {stats['full_calls']}"
+        )
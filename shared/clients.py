@@ -0,0 +1,49 @@
+import streamlit as st
+from supabase import create_client, Client
+from google import genai
+
+from shared.replay import GenAIProxy, SupabaseProxy, get_tape
+
+
+# =========================================================
+# عملاء Supabase & Gemini مشتركون بين كل الجلسات والأدوات
+# =========================================================
+
+def get_secret(name: str) -> str:
+    """
+    قراءة مفتاح سرّي من Streamlit Secrets، وإيقاف الصفحة برسالة واضحة إن لم يوجد.
+    """
+    try:
+        return st.secrets[name]
+    except Exception:
+        st.error(
+            "⚠️ فشل في تحميل المفاتيح السرّية (Secrets). "
+            "تأكدي من ضبط SUPABASE_URL, SUPABASE_KEY, GOOGLE_API_KEY في Streamlit Cloud."
+        )
+        st.stop()
+
+
+@st.cache_resource
+def get_supabase() -> Client:
+    """
+    عميل Supabase واحد للعملية كاملة بدلاً من إنشائه في كل rerun.
+    - في وضع replay لا يُنشأ اتصال حقيقي (ولا حاجة للمفاتيح).
+    """
+    tape = get_tape()
+    if tape is not None and tape.mode == "replay":
+        return SupabaseProxy(None, tape)
+    client = create_client(get_secret("SUPABASE_URL"), get_secret("SUPABASE_KEY"))
+    return SupabaseProxy(client, tape) if tape is not None else client
+
+
+@st.cache_resource
+def get_genai() -> genai.Client:
+    """
+    عميل Gemini واحد للعملية كاملة.
+    - في وضع replay لا يُنشأ اتصال حقيقي (ولا حاجة للمفاتيح).
+    """
+    tape = get_tape()
+    if tape is not None and tape.mode == "replay":
+        return GenAIProxy(None, tape)
+    client = genai.Client(api_key=get_secret("GOOGLE_API_KEY"))
+    return GenAIProxy(client, tape) if tape is not None else client
@@ -0,0 +1,28 @@
+import hashlib
+
+
+def hash_text(text: str) -> str:
+    """
+    هاش ثابت لنص واحد بعد توحيد المسافات، لضمان نفس النتيجة لنفس المحتوى.
+    """
+    normalized = " ".join(text.strip().split())  # إزالة المسافات الزائدة
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def hash_parts(*parts: str) -> str:
+    """
+    هاش ثابت لعدة مدخلات مفصولة بـ "---" (مثل منشوراتك + منشورات المنافسين).
+    """
+    combined = "\n---\n".join(part.strip() for part in parts).encode("utf-8")
+    return hashlib.sha256(combined).hexdigest()
+
+
+def tier_hash(tier: str, content_hash: str) -> str:
+    """
+    مفتاح الكاش لطبقة خدمة معيّنة:
+    - FULL يبقى الهاش نفسه (متوافق مع النتائج المخزّنة سابقاً).
+    - غيره يُشتق منه، فلا تختلط نتيجة النموذج السريع بنتيجة النموذج الأكبر.
+    """
+    if tier == "full":
+        return content_hash
+    return hashlib.sha256(f"{tier}:{content_hash}".encode("utf-8")).hexdigest()
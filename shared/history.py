@@ -0,0 +1,124 @@
+from datetime import datetime, timezone
+
+import streamlit as st
+
+from shared.analytics import get_session_visitor_id
+from shared.clients import get_supabase
+from shared.session import clear_session_data, session_data, set_result_ref, set_session_data
+
+# =========================================================
+# سجل التحليلات عبر الجلسات (analysis_history)
+# - كل صف يشير إلى الكاش عبر content_hash ولا يخزن النتيجة نفسها.
+# - مفاتيح الجلسة مسبوقة بـ app_id حتى لا تتداخل الأدوات في نفس الـ host.
+# - الصفحات المجلوبة ورقم الصفحة الحالية يُحفظان معاً في SessionStore،
+#   فيُحذفان معاً عند خمول الجلسة وتعود الجلسة للصفحة الأولى بكلفة صفحة واحدة.
+# =========================================================
+
+HISTORY_TABLE = "analysis_history"
+HISTORY_PAGE_SIZE = 10
+
+
+def record_history(app_id: str, content_hash: str, text: str):
+    """
+    تسجيل التحليل في سجل الزائر، وإعادة السجل المعروض إلى الصفحة الأولى.
+    """
+    try:
+        get_supabase().table(HISTORY_TABLE).upsert(
+            {
+                "visitor_id": get_session_visitor_id(),
+                "app_id": app_id,
+                "content_hash": content_hash,
+                "preview": " ".join(text.split())[:80],
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            },
+            on_conflict="visitor_id,app_id,content_hash",
+        ).execute()
+    except Exception as e:
+        print(f"[history_write] Error: {e}")
+    clear_session_data(app_id, "history_pages")
+    set_session_data(app_id, "history_page", 0)
+
+
+def fetch_history_page(app_id: str, cursor=None):
+    """
+    جلب صفحة واحدة من السجل بالترقيم بالمؤشر (keyset):
+    - يعتمد على الفهرس (visitor_id, app_id, created_at, id) بدلاً من offset.
+    - تكلفة كل صفحة ثابتة مهما كان عدد الإدخالات السابقة.
+    - يعيد None عند الخطأ حتى لا يُحفظ خطأ عابر كصفحة فارغة.
+    """
+    try:
+        query = (
+            get_supabase()
+            .table(HISTORY_TABLE)
+            .select("id,content_hash,preview,created_at")
+            .eq("visitor_id", get_session_visitor_id())
+            .eq("app_id", app_id)
+        )
+        if cursor:
+            created_at, row_id = cursor
+            # lte يعطي الفهرس حداً أعلى للمسح، وor يستبعد الصفوف حتى المؤشر ضمن نفس created_at
+            query = query.lte("created_at", created_at).or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.lt.{row_id})'
+            )
+        res = (
+            query.order("created_at", desc=True)
+            .order("id", desc=True)
+            .limit(HISTORY_PAGE_SIZE)
+            .execute()
+        )
+        return res.data or []
+    except Exception as e:
+        print(f"[history_read] Error: {e}")
+        return None
+
+
+def get_history_page(app_id: str, page: int):
+    """
+    إرجاع الصفحة المطلوبة من السجل مع تحميل تدريجي:
+    - الصفحات المجلوبة تُحفظ في الجلسة.
+    - لا تُجلب من Supabase إلا الصفحة التالية عند الحاجة.
+    - None إذا فشل الجلب، فتُعاد المحاولة في إعادة التشغيل التالية.
+    """
+    pages = session_data(app_id, "history_pages", [])
+    while len(pages) <= page:
+        cursor = None
+        if pages:
+            if len(pages[-1]) < HISTORY_PAGE_SIZE:
+                return []
+            last = pages[-1][-1]
+            cursor = (last["created_at"], last["id"])
+        rows = fetch_history_page(app_id, cursor)
+        if rows is None:
+            return None
+        pages.append(rows)
+    return pages[page]
+
+
+def render_history_sidebar(app_id: str):
+    """
+    عرض سجل التحليلات السابقة صفحةً صفحة في الشريط الجانبي.
+    """
+    with st.sidebar:
+        st.markdown("### 📚 تحليلاتك السابقة")
+        page = session_data(app_id, "history_page", 0)
+        rows = get_history_page(app_id, page)
+        if rows is None:
+            st.caption("تعذّر تحميل السجل حالياً، ستُعاد المحاولة تلقائياً.")
+            rows = []
+        elif not rows:
+            st.caption("لا توجد تحليلات سابقة بعد.")
+        for row in rows:
+            label = row["preview"] or row["content_hash"][:12]
+            if st.button(label, key=f"{app_id}:history_{row['id']}", use_container_width=True):
+                set_result_ref(app_id, row["content_hash"])
+
+        col_newer, col_older = st.columns(2)
+        with col_newer:
+            if page > 0 and st.button("→ الأحدث", key=f"{app_id}:history_newer"):
+                set_session_data(app_id, "history_page", page - 1)
+                st.rerun()
+        with col_older:
+            if len(rows) == HISTORY_PAGE_SIZE and st.button("الأقدم ←", key=f"{app_id}:history_older"):
+                set_session_data(app_id, "history_page", page + 1)
+                st.rerun()
@@ -0,0 +1,199 @@
+import json
+import time
+
+import streamlit as st
+from google.genai import types
+
+from shared.cache import get_cached, save_cached
+from shared.cascade import FAST, FULL, MODE_AUTO, choose_tier, get_cascade_metrics
+from shared.clients import get_genai
+from shared.hashing import tier_hash
+from shared.jsonstream import IncrementalJSONParser, repair_json, strip_fences
+from shared.replay import recorded_call
+
+# =========================================================
+# استدعاء Gemini الموحّد لأي أداة مسجّلة (مع احترام الكاش)
+# =========================================================
+
+# إكمال ذيل JSON المقطوع: طلب قصير بدلاً من إعادة التحليل كاملاً
+CONTINUATION_MAX_TOKENS = 1024
+CONTINUATION_PROMPT = (
+    "المستند JSON التالي انقطع قبل أن يكتمل. "
+    "أعد فقط الأحرف التي تأتي بعده مباشرةً لإكماله، "
+    "بدون تكرار أي جزء منه وبدون أسوار Markdown.\n\n"
+)
+
+
+def decode_result(tool, analysis_text: str):
+    """
+    تحويل النص المخزّن إلى نتيجة الأداة: dict للأدوات ذات المخطط، ونص كما هو لغيرها.
+    """
+    if tool.schema is None:
+        return analysis_text
+    return json.loads(analysis_text)
+
+
+def get_cached_result(tool, content_hash: str):
+    """
+    قراءة نتيجة سابقة من الكاش بالهاش (تُستخدم أيضاً لعرض السجل بدون إعادة الحساب).
+    """
+    cached = get_cached(tool.app_id, content_hash)
+    if not cached:
+        return None
+    try:
+        return decode_result(tool, cached)
+    except json.JSONDecodeError as e:
+        print(f"[cache_decode] Error: {e}")
+        return None
+
+
+def analyze(tool, mode: str = MODE_AUTO, on_items=None, **inputs):
+    """
+    1) يحاول قراءة النتيجة من الكاش بالهاش (مفتاح الكاش يتضمن طبقة الخدمة).
+    2) إذا لم يجدها، يستدعي النموذج السريع أولاً عند الإمكان،
+       ولا يصعد إلى النموذج الأكبر إلا إذا فشل استدعاؤه أو التحقق من مخرجاته.
+    - on_items: دالة تُستدعى بعناصر tool.stream_key المكتملة حتى الآن أثناء التدفق.
+    يعيد (النتيجة، هاش الكاش الذي خُزّنت تحته) ليُستخدم في السجل،
+    والهاش None إذا لم تُخزَّن النتيجة (فارغة، غير صالحة، أو جزئية بعد الإصلاح).
+    """
+    with recorded_call(tool.app_id, {"mode": mode, **inputs}):
+        return _analyze(tool, mode, on_items, **inputs)
+
+
+def _continue_json(model: str, partial_text: str) -> str:
+    """
+    طلب قصير لإكمال ذيل JSON مقطوع فقط بدلاً من إعادة التحليل كاملاً.
+    """
+    response = get_genai().models.generate_content(
+        model=model,
+        contents=CONTINUATION_PROMPT + partial_text,
+        config=types.GenerateContentConfig(
+            temperature=0.0,
+            max_output_tokens=CONTINUATION_MAX_TOKENS,
+        ),
+    )
+    return response.text or ""
+
+
+def parse_structured(model: str, analysis_text: str, validate=None):
+    """
+    تحويل رد JSON إلى dict مع الإصلاح عند الحاجة. يعيد (النتيجة، مكتملة؟):
+    1) json.loads مباشرة.
+    2) إزالة الأسوار/النص الزائد إن كان الكائن مكتملاً.
+    3) إن كان مقطوعاً: طلب إكمال الذيل فقط ثم التحليل مجدداً.
+    4) وإلا: أطول بادئة سليمة (نتيجة جزئية لا تُخزَّن في الكاش).
+    - validate: أي نتيجة مُصلَحة أو مُكمَّلة لا تُعدّ مكتملة إلا إذا اجتازت التحقق.
+    """
+    try:
+        return json.loads(analysis_text), True
+    except json.JSONDecodeError:
+        pass
+
+    def checked(result, complete):
+        return result, complete and (validate is None or bool(validate(result)))
+
+    result, complete = repair_json(analysis_text)
+    if complete or "{" not in analysis_text:
+        return checked(result, complete)
+
+    partial_text = strip_fences(analysis_text)
+    try:
+        continued, complete = repair_json(partial_text + _continue_json(model, partial_text))
+        if continued is not None:
+            return checked(continued, complete)
+    except Exception as e:
+        print(f"[json_continuation] Error: {e}")
+    return result, False
+
+
+def _generate(tool, model: str, inputs: dict, show_errors: bool = True, on_items=None):
+    """
+    استدعاء Gemini بإعدادات الأداة وإرجاع (النتيجة، النص المراد تخزينه).
+    - الأدوات ذات المخطط تُستدعى بالتدفق، وتُعرض عناصرها فور اكتمال كل عنصر.
+    - النتيجة None إذا تعذّر استرجاع JSON، والنص فارغ إذا كانت النتيجة جزئية (فلا تُخزَّن).
+    """
+    config_kwargs = dict(tool.generation)
+    if tool.system_instruction:
+        config_kwargs["system_instruction"] = tool.system_instruction
+    if tool.schema is not None:
+        config_kwargs["response_mime_type"] = "application/json"
+        config_kwargs["response_schema"] = tool.schema
+    config = types.GenerateContentConfig(**config_kwargs)
+
+    if tool.schema is None:
+        response = get_genai().models.generate_content(
+            model=model,
+            contents=tool.prompt(**inputs),
+            config=config,
+        )
+        analysis_text = response.text or ""
+        return analysis_text, analysis_text
+
+    parser = IncrementalJSONParser(tool.stream_key) if tool.stream_key else None
+    chunks = []
+    for chunk in get_genai().models.generate_content_stream(
+        model=model,
+        contents=tool.prompt(**inputs),
+        config=config,
+    ):
+        chunks.append(chunk.text or "")
+        if parser is not None and parser.feed(chunks[-1]) and on_items is not None:
+            on_items(list(parser.items))
+    analysis_text = "".join(chunks)
+
+    result, complete = parse_structured(model, analysis_text, tool.validate)
+    if result is None:
+        if show_errors:
+            st.error("⚠️ لم يتمكن النموذج من إرجاع JSON منظم. يظهر النص الخام أدناه لمراجعتك:")
+            st.code(analysis_text)
+        return None, analysis_text
+    if not complete:
+        print(f"[json_repair] {tool.app_id}: returning partial result from truncated output")
+        return result, ""
+    return result, json.dumps(result, ensure_ascii=False)
+
+
+def _analyze(tool, mode: str, on_items, **inputs):
+    base_hash = tool.content_hash(**inputs)
+    tier = choose_tier(tool, mode, inputs)
+
+    # نتيجة FULL المخزّنة مقبولة دائماً، ونتيجة FAST فقط إذا كان الطلب نفسه يُخدم بـ FAST
+    for cached_tier in (FULL, FAST) if tier == FAST else (FULL,):
+        content_hash = tier_hash(cached_tier, base_hash)
+        cached = get_cached_result(tool, content_hash)
+        if cached is not None:
+            return cached, content_hash
+
+    metrics = get_cascade_metrics()
+    if tier == FAST:
+        start = time.monotonic()
+        try:
+            result, analysis_text = _generate(
+                tool, tool.fast_model, inputs, show_errors=False, on_items=on_items
+            )
+        except Exception as e:
+            # نموذج سريع محدود المعدل أو غير متاح: نصعد إلى النموذج الأكبر بدلاً من الفشل
+            print(f"[cascade] {tool.app_id}: fast tier error, escalating: {e}")
+            metrics.record_escalation(tool.app_id, time.monotonic() - start)
+        else:
+            latency = time.monotonic() - start
+            if result is not None and analysis_text and tool.validate is not None and tool.validate(result):
+                metrics.record_fast(tool.app_id, latency)
+                content_hash = tier_hash(FAST, base_hash)
+                save_cached(tool.app_id, content_hash, analysis_text)
+                return result, content_hash
+            print(f"[cascade] {tool.app_id}: fast tier output failed validation, escalating")
+            metrics.record_escalation(tool.app_id, latency)
+
+    start = time.monotonic()
+    result, analysis_text = _generate(tool, tool.model, inputs, on_items=on_items)
+    metrics.record_full(tool.app_id, time.monotonic() - start)
+
+    content_hash = tier_hash(FULL, base_hash)
+    if result is None or not analysis_text.strip():
+        # لا نخزن ردّاً فارغاً أو غير صالح أو جزئياً في الكاش، ولا نعيد هاشاً لا يشير لشيء
+        return result, None
+
+    # تخزين في الكاش لمرات الاستخدام القادمة
+    save_cached(tool.app_id, content_hash, analysis_text)
+    return result, content_hash
@@ -0,0 +1,161 @@
+import json
+
+# =========================================================
+# تحليل JSON تدريجي وإصلاحه لمخرجات Gemini المنظمة
+# - IncrementalJSONParser: يستقبل أجزاء الرد المتدفق ويُخرج كل عنصر
+#   من المصفوفة المطلوبة (مثل missing_topics) فور اكتمال قوسه.
+# - repair_json: يعالج الأسوار (```json)، والنص الزائد بعد نهاية الكائن،
+#   والرد المقطوع قبل نهايته.
+# =========================================================
+
+CLOSERS = {"{": "}", "[": "]"}
+
+
+class _Scanner:
+    """
+    ماسح حالة JSON حرفاً حرفاً (داخل نص؟ عمق الأقواس؟ آخر مفتاح؟)
+    يُستخدم في التحليل التدريجي وفي الإصلاح معاً.
+    """
+
+    def __init__(self):
+        self.stack = []  # [(قوس الفتح, المفتاح الذي سبقه)]
+        self.in_string = False
+        self.escape = False
+        self.string_start = None
+        self.expect_key = False
+        self.last_key = None
+        self.pending_key = None
+
+    def step(self, text: str, i: int):
+        """
+        معالجة الحرف text[i]، وإرجاع ("open"|"close", القوس) عند فتح/إغلاق كائن أو مصفوفة.
+        """
+        ch = text[i]
+        if self.in_string:
+            if self.escape:
+                self.escape = False
+            elif ch == "\\":
+                self.escape = True
+            elif ch == '"':
+                self.in_string = False
+                if self.expect_key:
+                    self.last_key = json.loads(text[self.string_start:i + 1])
+            return None
+
+        if ch == '"':
+            self.in_string = True
+            self.string_start = i
+        elif ch == ":":
+            self.expect_key = False
+            self.pending_key = self.last_key
+        elif ch == ",":
+            self.expect_key = bool(self.stack) and self.stack[-1][0] == "{"
+            self.pending_key = None
+        elif ch in "{[":
+            key = self.pending_key if self.stack and self.stack[-1][0] == "{" else None
+            self.stack.append((ch, key))
+            self.expect_key = ch == "{"
+            self.pending_key = None
+            return "open", ch
+        elif ch in "}]":
+            if self.stack:
+                self.stack.pop()
+            self.expect_key = False
+            self.pending_key = None
+            return "close", ch
+        return None
+
+
+class IncrementalJSONParser:
+    """
+    تحليل تدريجي لرد JSON متدفق:
+    - feed(chunk) يُرجع قائمة العناصر التي اكتملت للتو داخل المصفوفة array_key.
+    - items يحتوي كل العناصر المكتملة حتى الآن بالترتيب.
+    """
+
+    def __init__(self, array_key: str):
+        self.array_key = array_key
+        self.buffer = ""
+        self.pos = 0
+        self.scanner = _Scanner()
+        self.item_start = None
+        self.items = []
+
+    def _in_target_array(self) -> bool:
+        stack = self.scanner.stack
+        return len(stack) == 2 and stack[0][0] == "{" and stack[1] == ("[", self.array_key)
+
+    def feed(self, chunk: str) -> list:
+        self.buffer += chunk
+        completed = []
+        while self.pos < len(self.buffer):
+            inside_before = self._in_target_array()
+            event = self.scanner.step(self.buffer, self.pos)
+            if event == ("open", "{") and inside_before:
+                self.item_start = self.pos
+            elif event == ("close", "}") and self.item_start is not None and self._in_target_array():
+                try:
+                    completed.append(json.loads(self.buffer[self.item_start:self.pos + 1]))
+                except json.JSONDecodeError:
+                    pass
+                self.item_start = None
+            self.pos += 1
+        self.items.extend(completed)
+        return completed
+
+
+def strip_fences(text: str) -> str:
+    """
+    إزالة أسوار Markdown (```json ... ```) إن أحاط بها النموذج الرد.
+    """
+    stripped = text.strip()
+    if stripped.startswith("```"):
+        stripped = stripped.split("\n", 1)[1] if "\n" in stripped else ""
+        if stripped.rstrip().endswith("```"):
+            stripped = stripped.rstrip()[:-3]
+    return stripped
+
+
+def repair_json(text: str):
+    """
+    محاولة إصلاح رد JSON غير صالح. تُرجع (النتيجة، مكتمل؟):
+    - مكتمل=True: الكائن انتهى بالفعل وأُزيل ما بعده (نص زائد/أسوار).
+    - مكتمل=False: الرد مقطوع؛ النتيجة هي أطول بادئة سليمة بعد إغلاق الأقواس المفتوحة.
+    - (None, False): لا يوجد كائن JSON يمكن استرجاعه.
+    """
+    text = strip_fences(text)
+    start = text.find("{")
+    if start == -1:
+        return None, False
+
+    scanner = _Scanner()
+    # نقاط قطع آمنة: (موضع القطع، نسخة من الأقواس المفتوحة عنده)
+    cuts = []
+    for i in range(start, len(text)):
+        was_in_string = scanner.in_string
+        ch = text[i]
+        if not was_in_string and ch == ",":
+            cuts.append((i, list(scanner.stack)))
+        event = scanner.step(text, i)
+        if event and event[0] == "close":
+            if not scanner.stack:
+                try:
+                    return json.loads(text[start:i + 1]), True
+                except json.JSONDecodeError:
+                    return None, False
+            cuts.append((i + 1, list(scanner.stack)))
+
+    # الرد مقطوع: نجرب الإغلاق عند النهاية ثم عند نقاط القطع الأقرب فالأبعد
+    tail = text[start:]
+    if scanner.in_string:
+        tail += "\\" if scanner.escape else ""
+        tail += '"'
+    candidates = [(tail, scanner.stack)]
+    candidates += [(text[start:pos], stack) for pos, stack in reversed(cuts)]
+    for candidate, stack in candidates:
+        closed = candidate.rstrip().rstrip(",") + "".join(CLOSERS[b] for b, _ in reversed(stack))
+        try:
+            return json.loads(closed), False
+        except json.JSONDecodeError:
+            continue
+    return None, False
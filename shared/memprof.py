@@ -0,0 +1,128 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+import streamlit as st
+
+from shared.session import get_session_store
+
+# =========================================================
+# قياس ذاكرة العامل (worker) لكل جلسة عبر tracemalloc
+# - يُفعَّل بـ LAB_MEMPROF=1 (له كلفة على الأداء، فلا يُفعَّل افتراضياً).
+# - التقرير يظهر في الشريط الجانبي عند فتح الصفحة بـ ?memprof=1،
+#   ويُطبع في الـ logs كل MEMPROF_LOG_SECONDS من خيط خلفي (لا داخل rerun أي زائر).
+# =========================================================
+
+MEMPROF_FRAMES = 10
+MEMPROF_TOP = 10
+MEMPROF_LOG_SECONDS = 300
+
+_state = {"baseline": None, "store": None, "logger": None}
+_state_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return os.environ.get("LAB_MEMPROF") == "1"
+
+
+def start_if_enabled():
+    if enabled() and not tracemalloc.is_tracing():
+        tracemalloc.start(MEMPROF_FRAMES)
+
+
+def deep_sizeof(obj, seen: set = None) -> int:
+    """
+    الحجم التقريبي لكائن وكل ما يحتويه (dict/list/tuple/set) بالبايت.
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def measure_session(entry: dict):
+    """
+    تسجيل حجم الجلسة الحالية: st.session_state + مدخلها في SessionStore.
+    """
+    if not enabled():
+        return
+    with _state_lock:
+        if _state["baseline"] is None:
+            _state["baseline"] = tracemalloc.get_traced_memory()[0]
+            # السجل يُمرَّر من خيط الجلسة، فالخيط الخلفي لا يحتاج سياق Streamlit
+            _state["store"] = get_session_store()
+            _state["logger"] = threading.Thread(target=_log_loop, name="memprof-log", daemon=True)
+            _state["logger"].start()
+    entry["bytes"] = deep_sizeof(st.session_state.to_dict()) + deep_sizeof(
+        {"refs": entry["refs"], "data": entry["data"]}
+    )
+
+
+def _log_loop():
+    """
+    طباعة تقرير الذاكرة دورياً؛ take_snapshot مكلف فلا يُنفَّذ داخل rerun أي جلسة.
+    """
+    while True:
+        time.sleep(MEMPROF_LOG_SECONDS)
+        try:
+            print(f"[memprof] {memory_report()}")
+        except Exception as e:
+            print(f"[memprof] Error: {e}")
+
+
+def memory_report(concurrency: int = None) -> dict:
+    """
+    تقرير الذاكرة:
+    - bytes_per_session_measured: متوسط الحجم المقاس لحالة الجلسات.
+    - bytes_per_session_traced: (الذاكرة المتتبَّعة - خط الأساس عند أول جلسة) / عدد الجلسات،
+      ويشمل كل ما تنشئه الجلسات (ومنه نمو الكاش المشترك).
+    - projected_bytes: تقدير الذاكرة لعدد جلسات متزامنة معيّن لتحديد حجم العامل.
+    """
+    if not tracemalloc.is_tracing():
+        return {"enabled": False}
+    current, peak = tracemalloc.get_traced_memory()
+    store = _state["store"] or get_session_store()
+    sessions = store.snapshot()
+    baseline = _state["baseline"] or current
+    count = len(sessions)
+    measured = sum(entry["bytes"] for entry in sessions) / count if count else 0
+    traced = max(0, current - baseline) / count if count else 0
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    )
+    top = snapshot.statistics("lineno")[:MEMPROF_TOP]
+    report = {
+        "enabled": True,
+        "traced_current_bytes": current,
+        "traced_peak_bytes": peak,
+        "baseline_bytes": baseline,
+        "sessions": count,
+        "bytes_per_session_measured": round(measured),
+        "bytes_per_session_traced": round(traced),
+        "top_allocations": [
+            {"where": str(stat.traceback[0]), "bytes": stat.size, "count": stat.count}
+            for stat in top
+        ],
+    }
+    if concurrency:
+        report["projected_bytes"] = round(baseline + concurrency * max(measured, traced))
+    return report
+
+
+def render_memory_report():
+    """
+    عرض تقرير الذاكرة في الشريط الجانبي عند فتح الصفحة بـ ?memprof=1.
+    """
+    if not enabled() or st.query_params.get("memprof") != "1":
+        return
+    with st.sidebar.expander("🧠 ذاكرة العامل"):
+        concurrency = st.number_input("جلسات متزامنة متوقعة", min_value=1, value=50, step=10)
+        st.json(memory_report(int(concurrency)))
@@ -0,0 +1,149 @@
+import importlib.util
+import re
+import sys
+import threading
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Callable, Optional
+
+import streamlit as st
+
+from shared import memprof
+from shared.analytics import track_visit
+from shared.cascade import render_cascade_metrics
+from shared.session import current_session
+
+# =========================================================
+# سجل الأدوات (Plugin Registry)
+# - كل مجلد أداة (مثل 1.ViralPotentialScorer) يحتوي tool.py خفيفاً يعرّف TOOL.
+# - واجهة الأداة (page.py) لا تُستورد إلا عند أول زيارة لصفحتها،
+#   ثم تبقى في sys.modules مشتركة بين كل الجلسات.
+# =========================================================
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TOOL_DIR_PATTERN = re.compile(r"^(\d+)\.(\w+)$")
+_load_lock = threading.RLock()
+
+# تشغيل tracemalloc مبكراً (قبل تحميل الأدوات) إذا كان LAB_MEMPROF=1
+memprof.start_if_enabled()
+
+
+@dataclass(frozen=True)
+class Tool:
+    """
+    تعريف أداة واحدة:
+    - app_id:       معرّف الأداة في Supabase (الكاش، التحليلات، السجل).
+    - prompt:       دالة تبني نص الطلب من مدخلات الأداة.
+    - content_hash: دالة تبني هاش الكاش من نفس المدخلات.
+    - schema:       مخطط JSON للإخراج المنظم (None = نص حر).
+    - fast_model:   نموذج أرخص وأسرع يُجرَّب أولاً (None = النموذج الأساسي دائماً).
+    - is_simple:    دالة على المدخلات: هل الطلب بسيط بما يكفي للنموذج السريع؟
+    - validate:     دالة على النتيجة: هل مخرجات النموذج السريع مقبولة أم نصعد؟
+    - stream_key:   مصفوفة داخل JSON تُعرض عناصرها تدريجياً أثناء التدفق.
+    - renderer:     "module:function" داخل مجلد الأداة، يُحمَّل عند الطلب.
+    """
+
+    app_id: str
+    title: str
+    icon: str
+    prompt: Callable[..., str]
+    content_hash: Callable[..., str]
+    model: str
+    schema: Optional[dict] = None
+    fast_model: Optional[str] = None
+    is_simple: Optional[Callable[..., bool]] = None
+    validate: Optional[Callable[..., bool]] = None
+    stream_key: Optional[str] = None
+    system_instruction: Optional[str] = None
+    generation: dict = field(default_factory=dict)
+    renderer: str = "page:render"
+    page_config: dict = field(default_factory=dict)
+    path: Optional[Path] = None
+
+    @property
+    def slug(self) -> str:
+        return re.sub(r"\W+", "_", self.path.name).lower()
+
+    @property
+    def url_path(self) -> str:
+        return TOOL_DIR_PATTERN.match(self.path.name).group(2).lower()
+
+
+def _load_module(name: str, path: Path):
+    """
+    استيراد ملف بالمسار (أسماء المجلدات تبدأ برقم فلا تصلح كحزم) مرة واحدة لكل عملية.
+    - القفل يمنع جلسة أخرى من رؤية الوحدة قبل اكتمال تنفيذها عند أول زيارة متزامنة.
+    """
+    with _load_lock:
+        if name in sys.modules:
+            return sys.modules[name]
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except Exception:
+            sys.modules.pop(name, None)
+            raise
+        return module
+
+
+@st.cache_resource
+def discover_tools() -> list:
+    """
+    اكتشاف كل الأدوات المسجّلة في جذر المستودع مرتبةً حسب رقم اليوم.
+    """
+    tools = []
+    for tool_dir in REPO_ROOT.iterdir():
+        match = TOOL_DIR_PATTERN.match(tool_dir.name)
+        if not match or not (tool_dir / "tool.py").is_file():
+            continue
+        slug = re.sub(r"\W+", "_", tool_dir.name).lower()
+        module = _load_module(f"lab_tool_{slug}", tool_dir / "tool.py")
+        tools.append((int(match.group(1)), replace(module.TOOL, path=tool_dir)))
+    return [tool for _, tool in sorted(tools, key=lambda item: item[0])]
+
+
+def load_renderer(tool: Tool) -> Callable:
+    """
+    تحميل دالة العرض الخاصة بالأداة عند أول طلب فقط.
+    """
+    module_name, func_name = tool.renderer.split(":")
+    module = _load_module(f"lab_{module_name}_{tool.slug}", tool.path / f"{module_name}.py")
+    return getattr(module, func_name)
+
+
+def run_tool(tool: Tool):
+    """
+    تشغيل صفحة أداة: إعداد الصفحة + تتبع الزيارة + العرض + المقاييس.
+    """
+    st.set_page_config(**tool.page_config)
+    session = current_session()
+    track_visit(tool.app_id)
+    load_renderer(tool)(tool)
+    render_cascade_metrics(tool.app_id)
+    memprof.measure_session(session)
+    memprof.render_memory_report()
+
+
+def as_st_page(tool: Tool):
+    """
+    تحويل الأداة إلى صفحة st.Page داخل الـ host متعدد الصفحات.
+    """
+    def page():
+        run_tool(tool)
+
+    page.__name__ = tool.url_path
+    return st.Page(page, title=tool.title, icon=tool.icon, url_path=tool.url_path)
+
+
+def run_standalone(app_file: str):
+    """
+    تشغيل أداة واحدة منفردة من app.py داخل مجلدها (نشر مستقل).
+    """
+    tool_dir = Path(app_file).resolve().parent
+    for tool in discover_tools():
+        if tool.path == tool_dir:
+            run_tool(tool)
+            return
+    st.error(f"⚠️ لم يتم العثور على tool.py في {tool_dir.name}.")
@@ -0,0 +1,354 @@
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import lru_cache
+from types import SimpleNamespace
+
+# =========================================================
+# تسجيل/إعادة تشغيل حركة Gemini و Supabase (Record / Replay)
+# - LAB_TRAFFIC_MODE=record: يمرّر الطلبات للخدمات الحقيقية ويسجّل
+#   الطلب + الرد + زمن الاستجابة في ملف JSONL مضغوط (gzip).
+# - LAB_TRAFFIC_MODE=replay: لا اتصال بالشبكة؛ الردود تُقرأ من الملف
+#   مع محاكاة زمن الاستجابة الأصلي مضروباً في LAB_LATENCY_SCALE.
+# - بدون LAB_TRAFFIC_MODE: الوضع الحي العادي بدون أي تغليف.
+# =========================================================
+
+DEFAULT_TRAFFIC_FILE = "traffic.jsonl.gz"
+# كتابات Supabase تحمل قيماً متغيرة (created_at, updated_at) فلا تتطابق حرفياً بين التشغيلات
+SUPABASE_WRITE_METHODS = {"insert", "upsert", "update", "delete"}
+# كل حدث يُكتب كعضو gzip مستقل ويُدفع فوراً؛ fsync على الأكثر كل هذه المدة
+TRAFFIC_FSYNC_SECONDS = 5
+
+
+class ReplayMiss(LookupError):
+    """طلب غير موجود في ملف التسجيل أثناء إعادة التشغيل."""
+
+
+def _signature(value) -> str:
+    """
+    تمثيل ثابت لأي طلب (يدعم كائنات pydantic مثل GenerateContentConfig).
+    """
+    def default(obj):
+        if hasattr(obj, "model_dump"):
+            return obj.model_dump(exclude_none=True, mode="json")
+        return repr(obj)
+
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=default)
+
+
+def _key(kind: str, request) -> str:
+    return hashlib.sha1(f"{kind}:{_signature(request)}".encode("utf-8")).hexdigest()
+
+
+def _shape(kind: str, request):
+    """
+    مفتاح احتياطي لكتابات Supabase فقط (قيمها متغيرة مثل created_at):
+    الجدول + أسماء الدوال في السلسلة.
+    بقية الطلبات (Gemini والقراءات) لا بديل لها: أي تغيير فيها يجب أن يظهر كـ miss
+    بدلاً من إعادة رد مسجّل لطلب آخر.
+    """
+    if kind != "supabase":
+        return None
+    chain = request["chain"]
+    if not any(step[0] in SUPABASE_WRITE_METHODS for step in chain):
+        return None
+    return f"{kind}:{chain[0][1][0]}:" + ".".join(step[0] for step in chain)
+
+
+class Tape:
+    """
+    ملف التسجيل: يكتب الأحداث في وضع record ويقرأها ويطابقها في وضع replay.
+    """
+
+    def __init__(self, mode: str, path: str, latency_scale: float = 1.0):
+        self.mode = mode
+        self.path = path
+        self.latency_scale = latency_scale
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.misses = 0
+        self.fallbacks = 0
+        self.by_key = defaultdict(deque)
+        self.by_shape = defaultdict(deque)
+        self.handle = None
+        self.last_fsync = time.monotonic()
+
+        if mode == "record":
+            self.handle = open(path, "ab")
+            atexit.register(self.close)
+        elif mode == "replay":
+            for event in load_events(path):
+                if event["kind"] == "call":
+                    continue
+                self.by_key[event["key"]].append(event)
+                if event.get("shape"):
+                    self.by_shape[event["shape"]].append(event)
+
+    def close(self):
+        with self.lock:
+            if self.handle:
+                self.handle.flush()
+                os.fsync(self.handle.fileno())
+                self.handle.close()
+                self.handle = None
+        self.last_fsync = time.monotonic()
+
+    def _write(self, event: dict):
+        """
+        كتابة الحدث كعضو gzip مستقل: أي قتل مفاجئ للعملية لا يُفقد إلا آخر حدث غير مكتمل.
+        """
+        line = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+        with self.lock:
+            if not self.handle:
+                return
+            self.handle.write(gzip.compress(line))
+            self.handle.flush()
+            if time.monotonic() - self.last_fsync >= TRAFFIC_FSYNC_SECONDS:
+                os.fsync(self.handle.fileno())
+                self.last_fsync = time.monotonic()
+
+    def log(self, kind: str, request: dict, start: float, response=None, error=None):
+        event = {
+            "kind": kind,
+            "key": _key(kind, request),
+            "shape": _shape(kind, request),
+            "t": round(start - self.started, 4),
+            "latency": round(time.monotonic() - start, 4),
+        }
+        if error is not None:
+            event["error"] = repr(error)
+        else:
+            event["response"] = response
+        self._write(event)
+
+    def record(self, kind: str, request: dict, send, to_payload):
+        """
+        تنفيذ الطلب الحقيقي وتسجيله (حتى الأخطاء تُسجَّل لتُعاد كما هي).
+        """
+        start = time.monotonic()
+        try:
+            response = send()
+        except Exception as e:
+            self.log(kind, request, start, error=e)
+            raise
+        self.log(kind, request, start, response=to_payload(response))
+        return response
+
+    def record_stream(self, kind: str, request: dict, stream):
+        """
+        تمرير رد متدفق كما هو مع تسجيل كل جزء وتوقيته منذ بداية الطلب.
+        """
+        start = time.monotonic()
+        chunks = []
+        try:
+            for chunk in stream():
+                chunks.append([round(time.monotonic() - start, 4), chunk.text or ""])
+                yield chunk
+        except Exception as e:
+            self.log(kind, request, start, error=e)
+            raise
+        self.log(kind, request, start, response={"chunks": chunks})
+
+    def replay_stream(self, kind: str, request: dict):
+        """
+        إعادة رد متدفق جزءاً جزءاً بنفس التوقيتات الأصلية (مضروبة في المعامل).
+        """
+        response = self.replay(kind, request, simulate_latency=False)
+        start = time.monotonic()
+        for offset, text in response["chunks"]:
+            if self.latency_scale > 0:
+                time.sleep(max(0.0, start + offset * self.latency_scale - time.monotonic()))
+            yield SimpleNamespace(text=text)
+
+    def replay(self, kind: str, request: dict, simulate_latency: bool = True) -> dict:
+        """
+        إرجاع الرد المسجّل لنفس الطلب (أو لنفس شكل كتابة Supabase) مع محاكاة زمنه.
+        """
+        with self.lock:
+            event = self._take(self.by_key[_key(kind, request)])
+            shape = _shape(kind, request)
+            if event is None and shape is not None:
+                event = self._take(self.by_shape[shape])
+                if event is not None:
+                    self.fallbacks += 1
+            if event is None:
+                self.misses += 1
+        if event is None:
+            raise ReplayMiss(f"{kind} request not found in {self.path}")
+        if simulate_latency and self.latency_scale > 0:
+            time.sleep(event["latency"] * self.latency_scale)
+        if "error" in event:
+            raise RuntimeError(event["error"])
+        return event["response"]
+
+    @staticmethod
+    def _take(queue: deque):
+        """
+        أخذ الحدث التالي بالترتيب، مع إعادة استخدام آخر حدث إذا تكرر الطلب أكثر مما سُجّل.
+        """
+        if not queue:
+            return None
+        return queue.popleft() if len(queue) > 1 else queue[0]
+
+    @contextmanager
+    def call(self, app_id: str, inputs: dict):
+        """
+        تسجيل استدعاء أداة كامل (المدخلات + الزمن الكلي) ليعيد bench تشغيله لاحقاً.
+        """
+        start = time.monotonic()
+        started_at = time.time()
+        try:
+            yield
+        finally:
+            if self.mode == "record":
+                self._write(
+                    {
+                        "kind": "call",
+                        "app_id": app_id,
+                        "inputs": inputs,
+                        "t": round(start - self.started, 4),
+                        # وقت حقيقي: يسمح بحساب مدة التسجيل حتى لو أُلحقت عدة عمليات بنفس الملف
+                        "ts": round(started_at, 4),
+                        "latency": round(time.monotonic() - start, 4),
+                    }
+                )
+
+
+def load_events(path: str) -> list:
+    """
+    قراءة أحداث ملف التسجيل مع تجاهل ذيل مقطوع (عضو gzip أو سطر غير مكتمل).
+    """
+    events = []
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    print(f"[replay] Ignoring incomplete last event in {path}")
+                    break
+    except (EOFError, gzip.BadGzipFile, zlib.error) as e:
+        print(f"[replay] Ignoring truncated tail of {path}: {e}")
+    return events
+
+
+@lru_cache(maxsize=None)
+def get_tape():
+    """
+    ملف التسجيل الحالي حسب متغيرات البيئة (None في الوضع الحي).
+    """
+    mode = os.environ.get("LAB_TRAFFIC_MODE", "").lower()
+    if mode not in ("record", "replay"):
+        return None
+    return Tape(
+        mode,
+        os.environ.get("LAB_TRAFFIC_FILE", DEFAULT_TRAFFIC_FILE),
+        float(os.environ.get("LAB_LATENCY_SCALE", "1.0")),
+    )
+
+
+@contextmanager
+def recorded_call(app_id: str, inputs: dict):
+    tape = get_tape()
+    if tape is None:
+        yield
+        return
+    with tape.call(app_id, inputs):
+        yield
+
+
+# =========================================================
+# أغلفة العملاء: نفس واجهة العملاء الحقيقيين المستخدمة في shared
+# =========================================================
+
+
+class _GenAIModels:
+    def __init__(self, inner, tape: Tape):
+        self._inner = inner
+        self._tape = tape
+
+    def generate_content(self, **kwargs):
+        request = {"method": "generate_content", **kwargs}
+        if self._tape.mode == "replay":
+            return SimpleNamespace(**self._tape.replay("genai", request))
+        return self._tape.record(
+            "genai",
+            request,
+            lambda: self._inner.generate_content(**kwargs),
+            lambda response: {"text": response.text},
+        )
+
+    def generate_content_stream(self, **kwargs):
+        request = {"method": "generate_content_stream", **kwargs}
+        if self._tape.mode == "replay":
+            return self._tape.replay_stream("genai", request)
+        return self._tape.record_stream(
+            "genai",
+            request,
+            lambda: self._inner.generate_content_stream(**kwargs),
+        )
+
+
+class GenAIProxy:
+    """
+    غلاف لعميل Gemini (inner=None في وضع replay).
+    """
+
+    def __init__(self, inner, tape: Tape):
+        self.models = _GenAIModels(inner.models if inner is not None else None, tape)
+
+
+class _QueryProxy:
+    """
+    يسجّل سلسلة الاستدعاءات (table/select/eq/...) ويطابقها عند execute().
+    """
+
+    def __init__(self, inner, tape: Tape, chain: list):
+        self._inner = inner
+        self._tape = tape
+        self._chain = chain
+
+    def __getattr__(self, name):
+        def step(*args, **kwargs):
+            inner = getattr(self._inner, name)(*args, **kwargs) if self._inner is not None else None
+            return _QueryProxy(inner, self._tape, self._chain + [[name, list(args), kwargs]])
+
+        return step
+
+    def execute(self):
+        request = {"chain": self._chain}
+        if self._tape.mode == "replay":
+            return SimpleNamespace(**self._tape.replay("supabase", request))
+        return self._tape.record(
+            "supabase",
+            request,
+            self._inner.execute,
+            lambda response: {"data": response.data},
+        )
+
+
+class SupabaseProxy:
+    """
+    غلاف لعميل Supabase (inner=None في وضع replay).
+    """
+
+    def __init__(self, inner, tape: Tape):
+        self._inner = inner
+        self._tape = tape
+
+    def table(self, name: str):
+        inner = self._inner.table(name) if self._inner is not None else None
+        return _QueryProxy(inner, self._tape, [["table", [name], {}]])
+
+    def rpc(self, fn: str, params: dict = None):
+        inner = self._inner.rpc(fn, params) if self._inner is not None else None
+        return _QueryProxy(inner, self._tape, [["rpc", [fn, params], {}]])
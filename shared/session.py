@@ -0,0 +1,100 @@
+import threading
+import time
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# =========================================================
+# حالة الجلسات محدودة الذاكرة
+# - النتائج الكبيرة لا تُنسخ لكل جلسة: الجلسة تحفظ (app_id, content_hash) فقط،
+#   والنتيجة نفسها تُقرأ من الكاش المشترك (shared.cache) عند العرض.
+# - بيانات الجلسة المؤقتة (مثل صفحات السجل) تُحفظ هنا لا في st.session_state،
+#   لتُحذف كلها عند خمول الجلسة أكثر من SESSION_IDLE_SECONDS.
+# =========================================================
+
+SESSION_IDLE_SECONDS = 30 * 60
+SWEEP_INTERVAL_SECONDS = 60
+
+
+class SessionStore:
+    """
+    سجل الجلسات النشطة في العملية: session_id -> {last_seen, refs, data, bytes}.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.last_sweep = time.monotonic()
+
+    def touch(self, session_id: str) -> dict:
+        now = time.monotonic()
+        with self.lock:
+            entry = self.sessions.get(session_id)
+            if entry is None:
+                entry = {"refs": {}, "data": {}, "bytes": 0}
+                self.sessions[session_id] = entry
+            entry["last_seen"] = now
+        if now - self.last_sweep >= SWEEP_INTERVAL_SECONDS:
+            self.sweep(now)
+        return entry
+
+    def sweep(self, now: float = None) -> int:
+        """
+        حذف الجلسات الخاملة وإرجاع عددها.
+        """
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            self.last_sweep = now
+            idle = [
+                session_id
+                for session_id, entry in self.sessions.items()
+                if now - entry["last_seen"] > SESSION_IDLE_SECONDS
+            ]
+            for session_id in idle:
+                del self.sessions[session_id]
+        if idle:
+            print(f"[session_sweep] Evicted {len(idle)} idle sessions")
+        return len(idle)
+
+    def snapshot(self) -> list:
+        with self.lock:
+            return [dict(entry) for entry in self.sessions.values()]
+
+
+@st.cache_resource
+def get_session_store() -> SessionStore:
+    return SessionStore()
+
+
+def current_session() -> dict:
+    """
+    مدخل الجلسة الحالية في السجل (يُحدّث وقت آخر نشاط).
+    """
+    ctx = get_script_run_ctx()
+    return get_session_store().touch(ctx.session_id if ctx else "local")
+
+
+def set_result_ref(app_id: str, content_hash: str):
+    """
+    حفظ مرجع النتيجة المعروضة (الهاش فقط) بدلاً من نسخ النتيجة في الجلسة.
+    """
+    current_session()["refs"][app_id] = content_hash
+
+
+def get_result_ref(app_id: str):
+    return current_session()["refs"].get(app_id)
+
+
+def session_data(app_id: str, key: str, default):
+    """
+    بيانات مؤقتة للجلسة الحالية (تُحذف مع الجلسة عند خمولها).
+    """
+    return current_session()["data"].setdefault(f"{app_id}:{key}", default)
+
+
+def set_session_data(app_id: str, key: str, value):
+    current_session()["data"][f"{app_id}:{key}"] = value
+
+
+def clear_session_data(app_id: str, key: str):
+    current_session()["data"].pop(f"{app_id}:{key}", None)
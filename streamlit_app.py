@@ -0,0 +1,12 @@
+import streamlit as st
+
+from shared.registry import as_st_page, discover_tools
+
+# =========================================================
+# الـ host متعدد الصفحات: كل الأدوات في عملية واحدة
+# - عملاء Supabase/Gemini، الكاش، والتحليلات مشتركة بين الأدوات.
+# - صفحة كل أداة (page.py) تُحمَّل عند أول زيارة لها فقط.
+# - إضافة أداة جديدة = مجلد "N.Name" فيه tool.py + page.py، بدون تعديل هذا الملف.
+# =========================================================
+
+st.navigation([as_st_page(tool) for tool in discover_tools()]).run()
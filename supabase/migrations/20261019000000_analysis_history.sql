@@ -0,0 +1,24 @@
+-- =========================================================
+-- سجل التحليلات لكل زائر عبر الجلسات (analysis_history)
+-- ---------------------------------------------------------
+-- كل صف يشير إلى نتيجة مخزّنة في viral_scores_cache عبر content_hash،
+-- فلا نكرّر نص التحليل هنا ولا نعيد حسابه عند فتحه من السجل.
+-- =========================================================
+
+create table if not exists public.analysis_history (
+    id           bigint generated always as identity primary key,
+    visitor_id   uuid        not null,
+    app_id       text        not null,
+    content_hash text        not null,
+    preview      text        not null default '',
+    created_at   timestamptz not null default now()
+);
+
+-- نفس الإدخال لنفس الزائر يظهر مرة واحدة (يُحدَّث created_at عند إعادة التحليل)
+create unique index if not exists analysis_history_visitor_app_hash_key
+    on public.analysis_history (visitor_id, app_id, content_hash);
+
+-- فهرس الترقيم بالمؤشر (keyset pagination):
+-- كل صفحة = Index Range Scan بطول الصفحة فقط مهما كبر السجل
+create index if not exists analysis_history_visitor_app_created_idx
+    on public.analysis_history (visitor_id, app_id, created_at desc, id desc);
@@ -0,0 +1,131 @@
+-- =========================================================
+-- تجميع التحليلات محلياً ثم دفعها دفعة واحدة (analytics_rollups)
+-- ---------------------------------------------------------
+-- كل عامل (worker) يجمع المشاهدات وضغطات CTA والزوار الفريدين
+-- (HyperLogLog بـ 4096 سجلاً ومقدّر Ertl المحسّن، خطأ معياري ≈ 1.6%) لكل تطبيق داخل
+-- نافذة زمنية بالساعة، ثم يكتب صفاً واحداً لكل (app_id, worker_id, bucket_start).
+-- القيم تراكمية داخل النافذة، فإعادة نفس الدفعة (retry) لا تضاعف العدّ.
+-- =========================================================
+
+create table if not exists public.analytics_rollups (
+    app_id              text        not null,
+    worker_id           text        not null,
+    bucket_start        timestamptz not null,
+    views               bigint      not null default 0,
+    cta_clicks          bigint      not null default 0,
+    visitors_hll        text        not null,  -- سجلات HyperLogLog بترميز base64
+    unique_visitors_est bigint      not null default 0,
+    updated_at          timestamptz not null default now(),
+    primary key (app_id, worker_id, bucket_start)
+);
+
+create index if not exists analytics_rollups_app_bucket_idx
+    on public.analytics_rollups (app_id, bucket_start);
+
+-- مجموع المشاهدات وضغطات CTA لكل تطبيق
+create or replace view public.analytics_totals as
+select app_id,
+       sum(views)      as views,
+       sum(cta_clicks) as cta_clicks
+from public.analytics_rollups
+group by app_id;
+
+-- دوال تصحيح مقدّر Ertl المحسّن (نفس HyperLogLog.count في shared/analytics.py):
+-- sigma للسجلات الصفرية، وtau للسجلات المشبعة (rank = q + 1).
+create or replace function public.hll_sigma(x float8)
+returns float8
+language plpgsql
+immutable strict
+as $$
+declare
+    y     float8 := 1;
+    z     float8 := x;
+    z_old float8;
+begin
+    if x = 1 then
+        return 'infinity';
+    end if;
+    loop
+        x := x * x;
+        z_old := z;
+        z := z + x * y;
+        y := y + y;
+        exit when z = z_old;
+    end loop;
+    return z;
+end;
+$$;
+
+create or replace function public.hll_tau(x float8)
+returns float8
+language plpgsql
+immutable strict
+as $$
+declare
+    y     float8 := 1;
+    z     float8;
+    z_old float8;
+begin
+    if x = 0 or x = 1 then
+        return 0;
+    end if;
+    z := 1 - x;
+    loop
+        x := sqrt(x);
+        z_old := z;
+        y := y * 0.5;
+        z := z - power(1 - x, 2) * y;
+        exit when z = z_old;
+    end loop;
+    return z / 3;
+end;
+$$;
+
+-- عدد الزوار الفريدين لتطبيق خلال فترة:
+-- دمج سجلات HyperLogLog لكل العمال والنوافذ (max لكل سجل) ثم التقدير.
+create or replace function public.analytics_unique_visitors(
+    p_app_id text,
+    p_from   timestamptz default '-infinity',
+    p_to     timestamptz default 'infinity'
+)
+returns bigint
+language sql
+stable
+as $$
+    -- فك ترميز base64 مرة واحدة لكل صف (materialized يمنع إعادة فكّه لكل سجل)
+    with blobs as materialized (
+        select decode(r.visitors_hll, 'base64') as regs
+        from public.analytics_rollups r
+        where r.app_id = p_app_id
+          and r.bucket_start >= p_from
+          and r.bucket_start < p_to
+    ),
+    regs as (
+        select i, max(get_byte(b.regs, i)) as reg
+        from blobs b
+        cross join lateral generate_series(0, length(b.regs) - 1) as i
+        group by i
+    ),
+    agg as (
+        select count(*)::float8                        as m,
+               64 - round(log(2, greatest(count(*), 1)))::int as q,
+               count(*) filter (where reg = 0)::float8 as zeros,
+               count(*) filter (where reg > 0)         as nonzero
+        from regs
+    ),
+    est as (
+        select a.m,
+               a.nonzero,
+               a.m * public.hll_tau(
+                   1 - (select count(*) from regs where reg = a.q + 1) / nullif(a.m, 0)
+               ) * power(2::float8, -a.q)
+               + coalesce((select sum(power(2::float8, -reg)) from regs where reg between 1 and a.q), 0)
+               + a.m * public.hll_sigma(a.zeros / nullif(a.m, 0)) as z
+        from agg a
+    )
+    select case
+               when m = 0 or nonzero = 0 then 0
+               else round(m * m / (2 * ln(2)) / z)
+           end::bigint
+    from est;
+$$;